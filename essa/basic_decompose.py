@@ -1,8 +1,226 @@
 import numpy as np
-from typing import Tuple, List
-from sklearn.utils.extmath import randomized_svd
+from collections.abc import Sequence
+from operator import index
+from typing import Iterator, Tuple, Union
+from scipy.linalg import LinAlgError, cholesky, eigh, get_blas_funcs, lu, qr, solve_triangular
 from scipy.linalg import svd as full_svd
 
+def _is_supported_dtype(dtype: np.dtype) -> bool:
+    """
+    Check whether a dtype can be used as the working floating point type.
+
+    Parameters
+    ----------
+    dtype : np.dtype
+        The dtype to check. None stands for the default np.float64.
+
+    Returns
+    -------
+    bool
+        True if the dtype is np.float32 or np.float64.
+    """
+    try:
+        dtype = np.dtype(dtype)
+    except TypeError:
+        return False
+    return dtype in (np.dtype(np.float32), np.dtype(np.float64))
+
+def _orthonormalize(Y: np.ndarray) -> np.ndarray:
+    """
+    Compute an orthonormal basis for the columns of a tall matrix.
+
+    Parameters
+    ----------
+    Y : np.ndarray
+        The matrix of size (m, l) with m >= l.
+
+    Returns
+    -------
+    np.ndarray
+        Matrix of size (m, l) with orthonormal columns spanning the columns of Y.
+
+    Notes
+    -----
+    Two passes of Cholesky-QR are used, which only need the small Gram matrix
+    Y.T @ Y and a triangular solve. If Y is too ill-conditioned for Cholesky-QR,
+    e.g. when the trajectory matrix has a lower rank than l, a Householder QR
+    is used instead.
+    """
+    Q = Y
+    for _ in range(2):
+        try:
+            R = cholesky(Q.T @ Q, lower=False, check_finite=False)
+        except LinAlgError:
+            return qr(Y, mode="economic", check_finite=False)[0]
+        diag = np.abs(np.diag(R))
+        if diag.min() <= diag.max() * np.finfo(Y.dtype).eps ** 0.25:
+            return qr(Y, mode="economic", check_finite=False)[0]
+        Q = solve_triangular(R, Q.T, trans="T", lower=False, check_finite=False).T
+    return Q
+
+def _randomized_svd(
+    matrix: np.ndarray, n_components: int, n_oversamples: int = 10, n_iter: int = 4, random_state: int = 0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute a truncated SVD with the randomized range finder of Halko et al.
+
+    Parameters
+    ----------
+    matrix : np.ndarray
+        The input matrix of size (m, n) to be decomposed.
+    n_components : int
+        The number of singular triplets to compute.
+    n_oversamples : int, optional
+        Additional random vectors used to sample the range, by default 10.
+    n_iter : int, optional
+        The number of power iterations, by default 4.
+    random_state : int, optional
+        Seed for the random test matrix, by default 0.
+
+    Returns
+    -------
+    U : np.ndarray
+        Left singular vectors of size (m, n_components)
+    s : np.ndarray
+        Singular values
+    Vt : np.ndarray
+        Right singular vectors of size (n_components, n)
+
+    Notes
+    -----
+    Power iterations are normalized with a pivoted LU factorization, which is
+    cheaper than QR and sufficient to keep the columns from collapsing onto the
+    leading singular vector. Only the final basis is orthonormalized.
+    """
+    m, n = matrix.shape
+    n_random = min(n_components + n_oversamples, m, n)
+    rng = np.random.default_rng(random_state)
+
+    Q = matrix @ rng.standard_normal((n, n_random)).astype(matrix.dtype, copy=False)
+    for _ in range(n_iter):
+        Q, _ = lu(matrix.T @ Q, permute_l=True, check_finite=False)
+        Q, _ = lu(matrix @ Q, permute_l=True, check_finite=False)
+    Q = _orthonormalize(Q)
+
+    U_small, s, Vt = full_svd(Q.T @ matrix, full_matrices=False, check_finite=False)
+    U = Q @ U_small
+
+    return U[:, :n_components], s[:n_components], Vt[:n_components]
+
+def _eigh_svd(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the thin SVD of a matrix from the eigendecomposition of its Gram matrix.
+
+    Parameters
+    ----------
+    matrix : np.ndarray
+        The input matrix of size (m, n) to be decomposed.
+
+    Returns
+    -------
+    U : np.ndarray
+        Left singular vectors of size (m, min(m, n))
+    s : np.ndarray
+        Singular values in descending order
+    Vt : np.ndarray
+        Right singular vectors of size (min(m, n), n)
+
+    Raises
+    ------
+    ValueError
+        If the matrix contains infs or NaNs
+
+    Notes
+    -----
+    The smaller Gram matrix is formed with the BLAS routine SYRK, which only
+    computes one triangle of the symmetric product. The singular vectors of the
+    other side are recovered by projection. Singular values below
+    sqrt(eps) * s.max() lose relative accuracy, as the Gram matrix squares the
+    condition number.
+    """
+    if not np.isfinite(matrix).all():
+        raise ValueError("array must not contain infs or NaNs")
+    transpose = matrix.shape[0] > matrix.shape[1]
+    A = matrix.T if transpose else matrix
+    syrk = get_blas_funcs("syrk", (A,))
+    gram = syrk(1.0, A)
+    w, U = eigh(gram, lower=False, overwrite_a=True, check_finite=False)
+    s = np.sqrt(np.clip(w[::-1], 0, None))
+    U = U[:, ::-1]
+    Vt = U.T @ A
+    np.divide(Vt, s[:, None], out=Vt, where=s[:, None] > 0)
+    if transpose:
+        return Vt.T, s, U.T
+    return U, s, Vt
+
+class ElementaryMatrices(Sequence):
+    """
+    Lazy sequence of elementary matrices built from factored SVD components.
+
+    Only the factors ``U``, ``sigma`` and ``V`` are stored; the i-th elementary
+    matrix ``sigma[i] * np.outer(U[:, i], V[:, i])`` is constructed on access.
+    Slicing returns a new ElementaryMatrices over the selected components.
+
+    Attributes
+    ----------
+    U : np.ndarray
+        Left singular vectors, one component per column.
+    sigma : np.ndarray
+        Singular values.
+    V : np.ndarray
+        Right singular vectors, one component per column.
+    """
+
+    def __init__(self, U: np.ndarray, sigma: np.ndarray, V: np.ndarray) -> None:
+        """
+        Initialize the ElementaryMatrices with the factored components.
+
+        Parameters
+        ----------
+        U : np.ndarray
+            Left singular vectors, one component per column.
+        sigma : np.ndarray
+            Singular values.
+        V : np.ndarray
+            Right singular vectors, one component per column.
+        """
+        self.U = U
+        self.sigma = sigma
+        self.V = V
+
+    def __len__(self) -> int:
+        return len(self.sigma)
+
+    def __getitem__(self, i: Union[int, slice]) -> Union[np.ndarray, "ElementaryMatrices"]:
+        if isinstance(i, slice):
+            return ElementaryMatrices(self.U[:, i], self.sigma[i], self.V[:, i])
+        i = index(i)
+        if not -len(self) <= i < len(self):
+            raise IndexError("elementary matrix index out of range")
+        return self.sigma[i] * np.outer(self.U[:, i], self.V[:, i])
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def sum(self, indices) -> np.ndarray:
+        """
+        Compute the sum of the selected elementary matrices.
+
+        Parameters
+        ----------
+        indices : array_like
+            Indices of the elementary matrices to be summed. A single index
+            selects one elementary matrix.
+
+        Returns
+        -------
+        np.ndarray
+            The grouped matrix, computed as a single matrix product.
+        """
+        idx = np.atleast_1d(np.asarray(indices, dtype=np.intp))
+        return (self.U[:, idx] * self.sigma[idx]) @ self.V[:, idx].T
+
 class BasicDecompose:
     """
     BasicDecompose performs Basic SSA decomposition on a given time series.
@@ -19,7 +237,9 @@ class BasicDecompose:
     window_size : int
         The size of the window for trajectory matrix embedding.
     svd_method : str
-        The method for Singular Value Decomposition ('full' or 'randomized').
+        The method for Singular Value Decomposition ('full', 'randomized' or 'eigh').
+    dtype : np.dtype
+        The floating point type used for all computations.
     ts_size : int
         The size of the time series.
     trajectory_matrix : np.ndarray
@@ -32,8 +252,8 @@ class BasicDecompose:
         Right singular vectors from SVD.
     d : int
         Rank of the trajectory matrix.
-    components : List[np.ndarray]
-        List of elementary matrices derived from the SVD components.
+    components : ElementaryMatrices
+        Lazy sequence of elementary matrices derived from the SVD components.
 
     Methods
     -------
@@ -41,7 +261,9 @@ class BasicDecompose:
         Fits the SSA decomposition to the data.
     """
 
-    def __init__(self, time_series: np.ndarray, window_size: int, svd_method: str = "full") -> None:
+    def __init__(
+        self, time_series: np.ndarray, window_size: int, svd_method: str = "full", dtype: np.dtype = np.float64
+    ) -> None:
         """
         Initialize the BasicDecompose class with a time series, window size, and SVD method.
 
@@ -52,9 +274,22 @@ class BasicDecompose:
         window_size : int
             The size of the window for trajectory matrix embedding.
         svd_method : str, optional
-            The method for Singular Value Decomposition ('full' or 'randomized'), by default 'full'.
+            The method for Singular Value Decomposition ('full', 'randomized' or 'eigh'),
+            by default 'full'. The 'eigh' method computes the SVD from the
+            eigendecomposition of the smaller Gram matrix of the trajectory matrix.
+        dtype : np.dtype, optional
+            The floating point type used for all computations, by default np.float64.
+            Using np.float32 halves memory traffic at the cost of precision.
+
+        Raises
+        ------
+        ValueError
+            If dtype is not np.float32 or np.float64
         """
-        self.time_series = time_series
+        if not _is_supported_dtype(dtype):
+            raise ValueError("dtype must be np.float32 or np.float64")
+        self.dtype = np.dtype(np.float64 if dtype is None else dtype)
+        self.time_series = np.asarray(time_series, dtype=self.dtype)
         self.svd_method = "full" if svd_method is None else svd_method
         self.ts_size = len(time_series)
         self.window_size = window_size
@@ -67,16 +302,17 @@ class BasicDecompose:
         -------
         np.ndarray
             Trajectory matrix of size (window_size, ts_size - window_size + 1)
+
+        Notes
+        -----
+        The trajectory matrix is a read-only view into the time series, so no
+        L x K buffer is allocated.
         """
-        return np.lib.stride_tricks.as_strided(
-            self.time_series,
-            shape=(self.window_size, self.ts_size - self.window_size + 1),
-            strides=(self.time_series.itemsize, self.time_series.itemsize),
-        )
+        return np.lib.stride_tricks.sliding_window_view(self.time_series, self.window_size).T
 
     def _svd(self, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
-        Compute singular value decomposition (SVD) of given matrix.
+        Compute the thin singular value decomposition (SVD) of given matrix.
 
         Parameters
         ----------
@@ -95,21 +331,28 @@ class BasicDecompose:
         Raises
         ------
         ValueError
-            If svd_method is not 'full' or 'randomized'
+            If svd_method is not 'full', 'randomized' or 'eigh'
         """
         if self.svd_method == "full":
-            U, s, Vt = full_svd(matrix)
+            U, s, Vt = full_svd(
+                np.array(matrix, order="F"),
+                full_matrices=False,
+                overwrite_a=True,
+                check_finite=False,
+                lapack_driver="gesdd",
+            )
         elif self.svd_method == "randomized":
-            U, s, Vt = randomized_svd(
+            U, s, Vt = _randomized_svd(
                 matrix,
                 n_components=self.window_size - self.window_size // 3,
                 n_oversamples=100,
-                random_state=0,
-                power_iteration_normalizer="LU",
                 n_iter=15,
+                random_state=0,
             )
+        elif self.svd_method == "eigh":
+            U, s, Vt = _eigh_svd(matrix)
         else:
-            raise ValueError("svd_method must be 'full' or 'randomized'")
+            raise ValueError("svd_method must be 'full', 'randomized' or 'eigh'")
 
         return U, s, Vt
 
@@ -134,23 +377,31 @@ class BasicDecompose:
 
         Notes
         -----
-        The rank of the trajectory matrix is determined using the matrix rank function
-        from numpy.linalg.
+        The rank of the trajectory matrix is determined from the singular values
+        with the same tolerance as numpy.linalg.matrix_rank, which avoids a
+        second SVD of the trajectory matrix. For the 'eigh' method the tolerance
+        is applied to the eigenvalues of the Gram matrix instead.
         """
         U, s, Vt = self._svd(self.trajectory_matrix)
-        d = np.linalg.matrix_rank(self.trajectory_matrix) if self.svd_method == "full" else self.window_size // 2 - 1
+        eps = max(self.trajectory_matrix.shape) * np.finfo(s.dtype).eps
+        if self.svd_method == "full":
+            d = int(np.count_nonzero(s > s.max(initial=0) * eps))
+        elif self.svd_method == "eigh":
+            d = int(np.count_nonzero(s**2 > s.max(initial=0) ** 2 * eps))
+        else:
+            d = self.window_size // 2 - 1
         V = Vt.T
 
         return U, s, V, d
 
-    def _elementary_matrix(self) -> List[np.ndarray]:
+    def _elementary_matrix(self) -> ElementaryMatrices:
         """
         Construct elementary matrices from SVD components.
 
         Returns
         -------
-        List[np.ndarray]
-            A list of elementary matrices
+        ElementaryMatrices
+            A lazy sequence of elementary matrices
 
         Notes
         -----
@@ -159,7 +410,7 @@ class BasicDecompose:
         initialized and available.
         """
 
-        return [self.sigma[i] * np.outer(self.U[:, i], self.V[:, i]) for i in range(self.d)]
+        return ElementaryMatrices(self.U[:, : self.d], self.sigma[: self.d], self.V[:, : self.d])
 
     def fit(self) -> None:
         """
@@ -179,7 +430,7 @@ class BasicDecompose:
 
         - `self.trajectory_matrix`: The trajectory matrix of the time series
         - `self.U`, `self.sigma`, `self.V`, and `self.d`: The SVD components of the trajectory matrix
-        - `self.components`: The elementary matrices constructed from the SVD components
+        - `self.components`: The elementary matrices constructed lazily from the SVD components
         """
         self.trajectory_matrix = self._trajectory_matrix()
         self.U, self.sigma, self.V, self.d = self._decompose_trajectory_matrix()
@@ -1,4 +1,4 @@
-from .basic_decompose import BasicDecompose
+from .basic_decompose import BasicDecompose, _is_supported_dtype
 from .toeplitz_decompose import ToeplitzDecompose
 from typing import Union
 import numpy as np
@@ -18,8 +18,22 @@ class Decompose:
         'toeplitz'. Default is 'basic'.
     svd_method : str, optional
         The method for performing SVD on the trajectory matrix for the basic
-        method. Options are 'full' or 'randomized'. Default is None, which
-        results in full SVD.
+        method. Options are 'full', 'randomized' or 'eigh'. Default is None,
+        which results in full SVD.
+    n_components : int, optional
+        The number of leading components to compute for the Toeplitz method.
+        Default is None, which computes all window_size components.
+    eigen_method : str, optional
+        The method for the eigendecomposition of the Toeplitz covariance
+        matrix. Options are 'full' or 'lanczos'. Default is None, which
+        results in full eigendecomposition. 'lanczos' requires n_components.
+    dtype : np.dtype, optional
+        The floating point type used for all computations. Default is
+        np.float64; np.float32 halves memory usage and bandwidth.
+    band_tol : float, optional
+        Relative tolerance for truncating the autocovariances of the Toeplitz
+        method, so that a banded eigensolver can be used. Default is None,
+        which keeps the exact covariance matrix.
 
     Returns
     -------
@@ -31,17 +45,38 @@ class Decompose:
         time_series: np.ndarray,
         window_size: int,
         method: str = "basic",
-        svd_method: str = None
+        svd_method: str = None,
+        n_components: int = None,
+        eigen_method: str = None,
+        dtype: np.dtype = np.float64,
+        band_tol: float = None
     ) -> Union[BasicDecompose, ToeplitzDecompose]:
         if method not in {"basic", "toeplitz"}:
             raise ValueError(f"Invalid method: {method}")
 
+        if not _is_supported_dtype(dtype):
+            raise ValueError("dtype must be np.float32 or np.float64")
+
         if method == "toeplitz":
             if svd_method is not None:
                 raise ValueError("SVD method is not supported for Toeplitz SSA")
-            return ToeplitzDecompose(time_series, window_size)
+            if n_components is not None and not 1 <= n_components <= window_size:
+                raise ValueError("n_components must be between 1 and window_size")
+            if eigen_method not in {"full", "lanczos", None}:
+                raise ValueError("eigen method must be 'full' or 'lanczos' for Toeplitz SSA")
+            if eigen_method == "lanczos" and (n_components is None or n_components >= window_size):
+                raise ValueError("lanczos eigen method requires n_components < window_size")
+            if band_tol is not None and not 0 <= band_tol < 1:
+                raise ValueError("band_tol must be between 0 and 1")
+            return ToeplitzDecompose(time_series, window_size, n_components, eigen_method, dtype, band_tol)
         
-        if svd_method not in {"full", "randomized", None}:
-            raise ValueError("SVD method must be 'full' or 'randomized' for Basic SSA")
+        if svd_method not in {"full", "randomized", "eigh", None}:
+            raise ValueError("SVD method must be 'full', 'randomized' or 'eigh' for Basic SSA")
+        if n_components is not None:
+            raise ValueError("n_components is only supported for Toeplitz SSA")
+        if eigen_method is not None:
+            raise ValueError("eigen method is not supported for Basic SSA")
+        if band_tol is not None:
+            raise ValueError("band_tol is only supported for Toeplitz SSA")
         
-        return BasicDecompose(time_series, window_size, svd_method)
\ No newline at end of file
+        return BasicDecompose(time_series, window_size, svd_method, dtype)
\ No newline at end of file
@@ -3,6 +3,91 @@ from .toeplitz_decompose import ToeplitzDecompose
 from typing import Union, List
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+def _diagonal_averaging_kernel(matrix: np.ndarray) -> np.ndarray:
+    """
+    Average a matrix over its anti-diagonals with explicit loops for numba.
+
+    Parameters
+    ----------
+    matrix : np.ndarray
+        The matrix of size (m, n) to be hankelized.
+
+    Returns
+    -------
+    np.ndarray
+        The time series of length m + n - 1, accumulated in float64 and
+        returned in the dtype of the matrix.
+    """
+    m, n = matrix.shape
+    reconstructed = np.zeros(m + n - 1)
+    for i in range(m):
+        for j in range(n):
+            reconstructed[i + j] += matrix[i, j]
+    for k in range(m + n - 1):
+        reconstructed[k] /= min(k + 1, m, n, m + n - 1 - k)
+    return reconstructed.astype(matrix.dtype)
+
+_diagonal_averaging_numba = None if njit is None else njit(cache=True)(_diagonal_averaging_kernel)
+
+def _antidiagonal_counts(m: int, n: int) -> np.ndarray:
+    """
+    Compute the number of elements on each anti-diagonal of a matrix.
+
+    Parameters
+    ----------
+    m : int
+        Number of rows.
+    n : int
+        Number of columns.
+
+    Returns
+    -------
+    np.ndarray
+        Number of elements on each of the ``m + n - 1`` anti-diagonals.
+    """
+    k = np.arange(m + n - 1)
+    return np.minimum(np.minimum(k + 1, m + n - 1 - k), min(m, n))
+
+def _diagonal_averaging(matrix: np.ndarray) -> np.ndarray:
+    """
+    Convert a matrix into a time series by averaging over its anti-diagonals.
+
+    Parameters
+    ----------
+    matrix : np.ndarray
+        The matrix of size (m, n) to be hankelized.
+
+    Returns
+    -------
+    np.ndarray
+        The time series of length m + n - 1.
+
+    Notes
+    -----
+    The anti-diagonal sums are accumulated in float64 by adding each row (or
+    column, whichever are fewer) into a shifted slice of the output, so no
+    m x n index array is allocated. If numba is installed, a compiled kernel
+    doing the same in a single pass is used instead. Both paths accumulate in
+    float64 and return the result in the dtype of the matrix.
+    """
+    if njit is not None:
+        return _diagonal_averaging_numba(matrix)
+
+    m, n = matrix.shape
+    sums = np.zeros(m + n - 1)
+    if m <= n:
+        for i in range(m):
+            sums[i : i + n] += matrix[i]
+    else:
+        for j in range(n):
+            sums[j : j + m] += matrix[:, j]
+    return (sums / _antidiagonal_counts(m, n)).astype(matrix.dtype, copy=False)
+
 def reconstruct(decompose: Union[BasicDecompose, ToeplitzDecompose], groups: Union[List[int], List[List[int]]]) -> np.ndarray:
     """
     Reconstruct the data given the SSA decomposition and the desired grouping of the elementary components.
@@ -12,28 +97,19 @@ def reconstruct(decompose: Union[BasicDecompose, ToeplitzDecompose], groups: Uni
     decompose : Union[BasicDecompose, ToeplitzDecompose]
         The decomposition object containing the elementary matrices.
     groups : Union[List[int], List[List[int]]]
-        The groups of elementary matrices to be used for reconstruction.
+        The groups of elementary matrices to be used for reconstruction. A
+        single index is treated as a group of one component.
 
     Returns
     -------
     np.ndarray
         The reconstructed time series.
     """
-    
-    def diagonal_averaging(matrix: np.ndarray) -> np.ndarray:
-        m, n = matrix.shape
-        reconstructed = np.zeros(m + n - 1)
-        for k in range(-m + 1, n):
-            diagonal = np.diagonal(matrix, offset=k)
-            reconstructed[k + m - 1] = diagonal.mean()
-        return reconstructed
-
     if not hasattr(decompose, "components"):
         raise ValueError("decompose time series before reconstruct")
 
-    components = []
-    for group in groups:
-        X_group = np.sum([decompose.components[i] for i in group], axis=0)
-        component = diagonal_averaging(X_group)
-        components.append(component)
-    return np.array(components)
+    components = np.empty((len(groups), decompose.ts_size), dtype=decompose.dtype)
+    for k, group in enumerate(groups):
+        X_group = decompose.components.sum(group)
+        components[k] = _diagonal_averaging(X_group)
+    return components
@@ -1,6 +1,56 @@
-from .basic_decompose import BasicDecompose
+from .basic_decompose import BasicDecompose, ElementaryMatrices
+from collections import OrderedDict
+from hashlib import blake2b
+from threading import Lock
 import numpy as np
-from typing import List
+from typing import Tuple
+from scipy.fft import irfft, next_fast_len, rfft
+from scipy.linalg import eig_banded, eigh, toeplitz
+from scipy.signal import correlate
+from scipy.sparse.linalg import LinearOperator, eigsh
+
+_AUTOCORRELATION_CACHE_SIZE = 8
+_autocorrelation_cache = OrderedDict()
+_autocorrelation_cache_lock = Lock()
+
+def _autocorrelation(series: np.ndarray) -> np.ndarray:
+    """
+    Compute the raw autocorrelation of a series for non-negative lags.
+
+    Parameters
+    ----------
+    series : np.ndarray
+        The centered time series.
+
+    Returns
+    -------
+    np.ndarray
+        Read-only array of unnormalized autocorrelations for lags 0 to N - 1.
+
+    Notes
+    -----
+    Results are kept in a small least-recently-used cache keyed on a digest of
+    the series contents and its dtype. Decomposing the same series with several
+    window sizes therefore computes the autocorrelation only once, at the cost
+    of an O(N) hash per call instead of an O(N log N) correlation. The cache
+    is guarded by a lock, so it can be used from several threads.
+    """
+    series = np.ascontiguousarray(series)
+    key = (blake2b(series.tobytes(), digest_size=16).digest(), series.dtype.str, len(series))
+    with _autocorrelation_cache_lock:
+        autocorrelation = _autocorrelation_cache.get(key)
+        if autocorrelation is not None:
+            _autocorrelation_cache.move_to_end(key)
+            return autocorrelation
+
+    N = len(series)
+    autocorrelation = correlate(series, series, mode='full', method='auto')[N - 1:]
+    autocorrelation.flags.writeable = False
+    with _autocorrelation_cache_lock:
+        _autocorrelation_cache[key] = autocorrelation
+        if len(_autocorrelation_cache) > _AUTOCORRELATION_CACHE_SIZE:
+            _autocorrelation_cache.popitem(last=False)
+    return autocorrelation
 
 class ToeplitzDecompose(BasicDecompose):
     """
@@ -15,14 +65,27 @@ class ToeplitzDecompose(BasicDecompose):
         The original time series data.
     window_size : int
         The size of the embedding window.
+    n_components : int
+        The number of leading components to compute, or None for all of them.
+    eigen_method : str
+        The method for the eigendecomposition ('full' or 'lanczos').
+    band_tol : float
+        Relative tolerance below which trailing autocovariances are truncated,
+        or None to keep all of them.
     time_series_centered : np.ndarray
         The centered version of the time series.
     ts_size : int
         The size of the time series.
     trajectory_matrix : np.ndarray
         The constructed trajectory matrix from the time series.
-    components : List[np.ndarray]
-        List of elementary matrices constructed from the Toeplitz covariance matrix
+    U : np.ndarray
+        Eigenvectors of the Toeplitz covariance matrix, ordered by sigma.
+    sigma : np.ndarray
+        Norms of the projections of the trajectory matrix onto the eigenvectors.
+    V : np.ndarray
+        Normalized projections of the trajectory matrix onto the eigenvectors.
+    components : ElementaryMatrices
+        Lazy sequence of elementary matrices constructed from the Toeplitz covariance matrix
 
     Methods
     -------
@@ -30,7 +93,15 @@ class ToeplitzDecompose(BasicDecompose):
         Fits the Toeplitz SSA decomposition to the data.
     """
 
-    def __init__(self, time_series: np.ndarray, window_size: int) -> None:
+    def __init__(
+        self,
+        time_series: np.ndarray,
+        window_size: int,
+        n_components: int = None,
+        eigen_method: str = "full",
+        dtype: np.dtype = np.float64,
+        band_tol: float = None,
+    ) -> None:
         """
         Initialize the ToeplitzDecompose class with a time series and window size.
 
@@ -40,17 +111,36 @@ class ToeplitzDecompose(BasicDecompose):
             The time series data to be analyzed.
         window_size : int
             The size of the window for trajectory matrix embedding.
+        n_components : int, optional
+            The number of leading eigenpairs of the Toeplitz covariance matrix
+            to compute, by default None, which computes all of them.
+        eigen_method : str, optional
+            The method for the eigendecomposition of the Toeplitz covariance
+            matrix ('full' or 'lanczos'), by default 'full'. The 'lanczos'
+            method requires `n_components` smaller than `window_size`.
+        dtype : np.dtype, optional
+            The floating point type used for all computations, by default np.float64.
+        band_tol : float, optional
+            Truncate the autocovariances after the last lag whose magnitude is
+            at least `band_tol` times the variance, by default None, which keeps
+            all lags. A narrow band lets the 'full' method use a banded
+            eigensolver, at the cost of approximating the covariance matrix:
+            each eigenvalue moves by at most twice the sum of the magnitudes of
+            the dropped autocovariances.
 
         Returns
         -------
         None
         """
-        super().__init__(time_series, window_size)
+        super().__init__(time_series, window_size, dtype=dtype)
+        self.n_components = n_components
+        self.eigen_method = "full" if eigen_method is None else eigen_method
+        self.band_tol = band_tol
         self.time_series_centered = self.time_series - np.mean(self.time_series)
     
-    def _toeplitz_matrix(self) -> np.ndarray:
+    def _autocovariance(self) -> np.ndarray:
         """
-        Compute the Toeplitz matrix for the centered time series.
+        Compute the autocovariances of the centered time series.
 
         Parameters
         ----------
@@ -59,17 +149,131 @@ class ToeplitzDecompose(BasicDecompose):
         Returns
         -------
         np.ndarray
-            The Toeplitz matrix
+            The autocovariances for lags 0 to window_size - 1
+
+        Notes
+        -----
+        The autocorrelation does not depend on the window size, so it is
+        shared through a module-level cache between decompositions of the same
+        series with different window sizes.
+
+        If `band_tol` is set, the autocovariances after the last lag whose
+        magnitude is at least `band_tol` times the variance are set to zero.
         """
         L = self.window_size
         N = self.ts_size
-        centered_series = self.time_series_centered
-        covs = np.correlate(centered_series, centered_series, mode='full')[N - 1:]
-        covs[: L] /= np.arange(N, N - L, -1)
-        covs[L:] /= np.arange(N - L, 0, -1)
-        return np.fromfunction(lambda i, j: covs[np.abs(i - j)], (L, L), dtype=int)
+        covs = _autocorrelation(self.time_series_centered)[:L] / np.arange(N, N - L, -1, dtype=self.dtype)
+        if self.band_tol is not None:
+            significant = np.flatnonzero(np.abs(covs) >= self.band_tol * np.abs(covs[0]))
+            covs[significant[-1] + 1 if len(significant) else 1:] = 0
+        return covs
 
-    def _decompose_toeplitz_matrix(self, trajectory_matrix: np.ndarray) -> List[np.ndarray]:
+    def _toeplitz_matrix(self, covs: np.ndarray = None) -> np.ndarray:
+        """
+        Compute the Toeplitz matrix for the centered time series.
+
+        Parameters
+        ----------
+        covs : np.ndarray, optional
+            Autocovariances already computed by `_autocovariance`, by default
+            None, which computes them.
+
+        Returns
+        -------
+        np.ndarray
+            The Toeplitz matrix
+        """
+        return toeplitz(self._autocovariance() if covs is None else covs)
+
+    def _toeplitz_operator(self) -> LinearOperator:
+        """
+        Build a linear operator applying the Toeplitz matrix without forming it.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        LinearOperator
+            The Toeplitz matrix as a linear operator
+
+        Notes
+        -----
+        The Toeplitz matrix is embedded into a circulant matrix, so each product
+        costs O(L log L) using the FFT.
+        """
+        L = self.window_size
+        covs = self._autocovariance()
+        nfft = next_fast_len(2 * L - 1, real=True)
+        circulant = np.zeros(nfft, dtype=covs.dtype)
+        circulant[:L] = covs
+        circulant[nfft - L + 1:] = covs[:0:-1]
+        circulant_fft = rfft(circulant)
+
+        def matmat(V: np.ndarray) -> np.ndarray:
+            V_fft = rfft(V, n=nfft, axis=0)
+            return irfft(circulant_fft[:, None] * V_fft, n=nfft, axis=0)[:L]
+
+        return LinearOperator(
+            (L, L),
+            matvec=lambda v: matmat(v.reshape(L, 1)),
+            matmat=matmat,
+            rmatvec=lambda v: matmat(v.reshape(L, 1)),
+            dtype=covs.dtype,
+        )
+
+    def _toeplitz_eigenvectors(self) -> np.ndarray:
+        """
+        Compute the eigenvectors of the Toeplitz covariance matrix.
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        -------
+        np.ndarray
+            The eigenvectors, one per column
+
+        Notes
+        -----
+        With the 'full' method, if the autocovariances vanish after a lag that
+        is small compared to the window size, e.g. after truncation with
+        `band_tol`, the banded eigensolver is used instead of the dense one.
+
+        Raises
+        ------
+        ValueError
+            If eigen_method is not 'full' or 'lanczos', or if 'lanczos' is used
+            without `n_components` smaller than `window_size`
+        """
+        L = self.window_size
+        if self.eigen_method == "full":
+            covs = self._autocovariance()
+            nonzero = np.flatnonzero(covs)
+            bandwidth = nonzero[-1] if len(nonzero) else 0
+            select_range = None if self.n_components is None else (L - self.n_components, L - 1)
+            if bandwidth < L // 4:
+                band = np.zeros((bandwidth + 1, L), dtype=covs.dtype)
+                for k in range(bandwidth + 1):
+                    band[k, : L - k] = covs[k]
+                _, eigen_vecs = eig_banded(
+                    band, lower=True, select="a" if select_range is None else "i", select_range=select_range
+                )
+            else:
+                _, eigen_vecs = eigh(self._toeplitz_matrix(covs), subset_by_index=select_range)
+        elif self.eigen_method == "lanczos":
+            if self.n_components is None or self.n_components >= L:
+                raise ValueError("lanczos eigen_method requires n_components < window_size")
+            v0 = np.random.default_rng(0).standard_normal(L).astype(self.dtype)
+            _, eigen_vecs = eigsh(self._toeplitz_operator(), k=self.n_components, which='LA', v0=v0)
+        else:
+            raise ValueError("eigen_method must be 'full' or 'lanczos'")
+
+        return eigen_vecs
+
+    def _decompose_toeplitz_matrix(self, trajectory_matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
         Decompose the trajectory matrix using the Toeplitz covariance matrix.
 
@@ -80,28 +284,36 @@ class ToeplitzDecompose(BasicDecompose):
 
         Returns
         -------
-        List[np.ndarray]
-            A list of elementary matrices
+        U : np.ndarray
+            Eigenvectors of the Toeplitz covariance matrix
+        sigma : np.ndarray
+            Norms of the projections onto the eigenvectors
+        V : np.ndarray
+            Normalized projections onto the eigenvectors
 
         Notes
         -----
         This method uses the eigenvectors of the Toeplitz covariance matrix to
-        decompose the trajectory matrix into its elementary matrices. The
-        elementary matrices are then ordered in descending order of their
-        importance, which is determined by their norm.
+        decompose the trajectory matrix into factored elementary matrices. The
+        projections onto all eigenvectors are computed with a single matrix
+        product, and the components are ordered in descending order of their
+        importance, which is determined by the norm of the projection.
+
+        If `n_components` is set, only the leading eigenpairs of the Toeplitz
+        covariance matrix are computed. With the 'lanczos' method the Toeplitz
+        matrix is never formed explicitly.
         """
         X = trajectory_matrix
-        C_tilde = self._toeplitz_matrix()
-        eigen_vals, eigen_vecs = np.linalg.eigh(C_tilde)
-        order = np.argsort(eigen_vals)[::-1]
-        elementary_matrices = []
-        for idx in order:
-            eigen_val = eigen_vals[idx]
-            eigen_vec = eigen_vecs[:, idx]
-            elementary_matrix = eigen_val * np.outer(eigen_vec, X.T @ eigen_vec)
-            elementary_matrices.append(elementary_matrix)
-
-        return elementary_matrices
+        eigen_vecs = self._toeplitz_eigenvectors()
+        proj = X.T @ eigen_vecs
+        sigma = np.linalg.norm(proj, axis=0)
+        order = np.argsort(sigma)[::-1]
+        U = eigen_vecs[:, order]
+        sigma = sigma[order]
+        V = proj[:, order]
+        np.divide(V, sigma, out=V, where=sigma > 0)
+
+        return U, sigma, V
 
     def fit(self) -> None:
         """
@@ -120,8 +332,10 @@ class ToeplitzDecompose(BasicDecompose):
         This method sets the following attributes:
 
         - `self.trajectory_matrix`: The trajectory matrix of the time series
-        - `self.components`: The elementary matrices constructed from the
-          Toeplitz covariance matrix
+        - `self.U`, `self.sigma`, and `self.V`: The factored Toeplitz components
+        - `self.components`: The elementary matrices constructed lazily from
+          the Toeplitz components
         """
         self.trajectory_matrix = self._trajectory_matrix()
-        self.components = self._decompose_toeplitz_matrix(self.trajectory_matrix)
+        self.U, self.sigma, self.V = self._decompose_toeplitz_matrix(self.trajectory_matrix)
+        self.components = ElementaryMatrices(self.U, self.sigma, self.V)
@@ -24,6 +24,8 @@ setup(
     install_requires=[
         "numpy>=2.0.0",
         "scipy>=1.11.0",
-        "scikit-learn>=1.5.0",
     ],
+    extras_require={
+        "numba": ["numba>=0.60.0"],
+    },
 )
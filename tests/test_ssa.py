@@ -1,3 +1,4 @@
+import importlib
 import numpy as np
 import pytest
 from essa import Decompose, reconstruct
@@ -116,3 +117,342 @@ def test_reconstruct_validation():
     decomposer.fit()
     reconstructed = reconstruct(decomposer, [[0]])
     assert reconstructed.shape[0] == 1
+
+def test_basic_full_reconstruction():
+    # Generate synthetic data
+    t = np.linspace(0, 10, 200)
+    series = np.sin(t) + 0.3*t
+
+    decomposer = Decompose(time_series=series, window_size=30)
+    decomposer.fit()
+
+    # Summing all components and averaging over anti-diagonals recovers the series
+    reconstructed = reconstruct(decomposer, [list(range(decomposer.d))])[0]
+    np.testing.assert_allclose(reconstructed, series, atol=1e-8)
+
+def test_basic_components_are_lazy():
+    # Generate synthetic data
+    t = np.linspace(0, 2*np.pi, 100)
+    series = np.sin(t) + 0.5*np.sin(3*t)
+
+    decomposer = Decompose(time_series=series, window_size=20)
+    decomposer.fit()
+    components = decomposer.components
+
+    # Each component is built on access from the stored factors
+    expected = decomposer.sigma[1] * np.outer(decomposer.U[:, 1], decomposer.V[:, 1])
+    np.testing.assert_allclose(components[1], expected)
+
+    # Grouped sums match summing individual elementary matrices
+    np.testing.assert_allclose(components.sum([0, 2]), components[0] + components[2])
+
+    with pytest.raises(IndexError):
+        components[len(components)]
+
+    # Slices behave like slices of a list of matrices
+    leading = components[:3]
+    assert len(leading) == 3
+    np.testing.assert_allclose(leading[2], components[2])
+    np.testing.assert_allclose(components[::-1][0], components[-1])
+    assert len(list(components[1:])) == len(components) - 1
+
+def test_toeplitz_full_reconstruction():
+    # Generate synthetic data
+    t = np.linspace(0, 10, 200)
+    series = np.sin(t) + 0.5*np.sin(3*t)
+
+    decomposer = Decompose(time_series=series, window_size=30, method="toeplitz")
+    decomposer.fit()
+
+    # Components are ordered by the norm of their projections
+    assert np.all(np.diff(decomposer.sigma) <= 0)
+
+    # Projections onto the full eigenbasis add up to the original series
+    reconstructed = reconstruct(decomposer, [list(range(decomposer.window_size))])[0]
+    np.testing.assert_allclose(reconstructed, series, atol=1e-8)
+
+def test_trajectory_matrix_is_hankel_view():
+    # Non-contiguous input series
+    series = np.arange(40.0)[::2]
+
+    decomposer = Decompose(time_series=series, window_size=5)
+    X = decomposer._trajectory_matrix()
+
+    assert X.shape == (5, 16)
+    assert np.shares_memory(X, series)
+    np.testing.assert_array_equal(X[:, 0], series[:5])
+    np.testing.assert_array_equal(X[1, :], series[1:17])
+
+def test_toeplitz_n_components():
+    # Generate synthetic data
+    t = np.linspace(0, 10, 200)
+    series = np.sin(t) + 0.5*np.sin(3*t)
+
+    full = Decompose(time_series=series, window_size=30, method="toeplitz")
+    full.fit()
+    truncated = Decompose(time_series=series, window_size=30, method="toeplitz", n_components=4)
+    truncated.fit()
+
+    assert len(truncated.components) == 4
+    np.testing.assert_allclose(truncated.sigma, full.sigma[:4])
+    np.testing.assert_allclose(
+        reconstruct(truncated, [[0, 1, 2, 3]]), reconstruct(full, [[0, 1, 2, 3]]), atol=1e-8
+    )
+
+    # n_components is validated
+    with pytest.raises(ValueError):
+        Decompose(time_series=series, window_size=30, method="toeplitz", n_components=31)
+    with pytest.raises(ValueError):
+        Decompose(time_series=series, window_size=30, n_components=4)
+
+def test_toeplitz_lanczos():
+    # Generate synthetic data
+    np.random.seed(0)
+    t = np.linspace(0, 10, 300)
+    series = np.sin(t) + 0.5*np.sin(3*t) + 0.1*np.random.randn(len(t))
+
+    full = Decompose(time_series=series, window_size=40, method="toeplitz", n_components=4)
+    full.fit()
+    lanczos = Decompose(time_series=series, window_size=40, method="toeplitz", n_components=4, eigen_method="lanczos")
+    lanczos.fit()
+
+    # Same leading subspace as the dense eigendecomposition
+    np.testing.assert_allclose(lanczos.sigma, full.sigma, rtol=1e-6)
+    np.testing.assert_allclose(
+        reconstruct(lanczos, [[0, 1, 2, 3]]), reconstruct(full, [[0, 1, 2, 3]]), atol=1e-6
+    )
+
+    # Lanczos needs a truncated number of components
+    with pytest.raises(ValueError):
+        Decompose(time_series=series, window_size=40, method="toeplitz", eigen_method="lanczos")
+    with pytest.raises(ValueError):
+        Decompose(time_series=series, window_size=40, method="toeplitz", eigen_method="invalid")
+
+def test_float32_decomposition():
+    # Generate synthetic data
+    t = np.linspace(0, 10, 200)
+    series = np.sin(t) + 0.5*np.sin(3*t)
+
+    for method in ["basic", "toeplitz"]:
+        reference = Decompose(time_series=series, window_size=30, method=method)
+        reference.fit()
+        decomposer = Decompose(time_series=series, window_size=30, method=method, dtype=np.float32)
+        decomposer.fit()
+
+        assert decomposer.time_series.dtype == np.float32
+        assert decomposer.U.dtype == np.float32
+
+        reconstructed = reconstruct(decomposer, [[0, 1]])
+        assert reconstructed.dtype == np.float32
+        np.testing.assert_allclose(reconstructed, reconstruct(reference, [[0, 1]]), atol=1e-4)
+
+    # Only floating point working types are accepted
+    for dtype in [np.int64, np.float16, np.complex128, "invalid"]:
+        with pytest.raises(ValueError):
+            Decompose(time_series=series, window_size=30, dtype=dtype)
+
+def test_reconstruct_single_index_groups():
+    # Generate synthetic data
+    t = np.linspace(0, 2*np.pi, 100)
+    series = np.sin(t) + 0.5*np.sin(3*t)
+
+    decomposer = Decompose(time_series=series, window_size=20)
+    decomposer.fit()
+
+    # Plain indices are treated as single-component groups
+    np.testing.assert_allclose(reconstruct(decomposer, [0, 1]), reconstruct(decomposer, [[0], [1]]))
+
+    # Indices beyond the number of components are rejected
+    with pytest.raises(IndexError):
+        reconstruct(decomposer, [[len(decomposer.components)]])
+
+def test_diagonal_averaging_kernels_agree(monkeypatch):
+    reconstruct_module = importlib.import_module("essa.reconstruct")
+
+    matrix = np.random.default_rng(0).standard_normal((7, 12))
+    expected = np.array([np.fliplr(matrix).diagonal(offset=k).mean() for k in range(11, -7, -1)])
+
+    # Float32 input over long anti-diagonals is accumulated in float64
+    matrix32 = np.random.default_rng(1).standard_normal((500, 2000)).astype(np.float32)
+    expected32 = reconstruct_module._diagonal_averaging(matrix32.astype(np.float64)).astype(np.float32)
+
+    for kernel in ["compiled", "numpy"]:
+        if kernel == "numpy":
+            monkeypatch.setattr(reconstruct_module, "njit", None)
+        np.testing.assert_allclose(reconstruct_module._diagonal_averaging(matrix), expected)
+        averaged32 = reconstruct_module._diagonal_averaging(matrix32)
+        assert averaged32.dtype == np.float32
+        np.testing.assert_allclose(averaged32, expected32, rtol=0, atol=1e-7)
+
+def test_toeplitz_window_size_sweep():
+    toeplitz_decompose = importlib.import_module("essa.toeplitz_decompose")
+
+    # Generate synthetic data
+    t = np.linspace(0, 10, 200)
+    series = np.sin(t) + 0.5*np.sin(3*t)
+
+    # Decompositions of the same series share one cached autocorrelation
+    toeplitz_decompose._autocorrelation_cache.clear()
+    for window_size in [10, 20, 30]:
+        decomposer = Decompose(time_series=series, window_size=window_size, method="toeplitz")
+        decomposer.fit()
+        assert len(decomposer.components) == window_size
+    assert len(toeplitz_decompose._autocorrelation_cache) == 1
+
+    # Cached values match a direct computation
+    centered = series - series.mean()
+    cached = toeplitz_decompose._autocorrelation(centered)
+    assert not cached.flags.writeable
+    np.testing.assert_allclose(cached, np.correlate(centered, centered, mode="full")[len(series) - 1:], atol=1e-10)
+
+    # Different contents or dtype use separate entries
+    Decompose(time_series=2*series, window_size=30, method="toeplitz").fit()
+    Decompose(time_series=series, window_size=30, method="toeplitz", dtype=np.float32).fit()
+    assert len(toeplitz_decompose._autocorrelation_cache) == 3
+
+def test_toeplitz_components_are_lazy():
+    # Generate synthetic data
+    t = np.linspace(0, 2*np.pi, 100)
+    series = np.sin(t) + 0.5*np.sin(3*t)
+
+    decomposer = Decompose(time_series=series, window_size=20, method="toeplitz")
+    decomposer.fit()
+
+    # Each component is the projection of the trajectory matrix onto an eigenvector
+    U_1 = decomposer.U[:, 1]
+    np.testing.assert_allclose(decomposer.components[1], np.outer(U_1, U_1 @ decomposer.trajectory_matrix), atol=1e-12)
+
+def test_toeplitz_banded_covariance(monkeypatch):
+    toeplitz_decompose = importlib.import_module("essa.toeplitz_decompose")
+
+    # MA(2) series: sample autocovariances after lag 2 are small but nonzero
+    noise = np.random.default_rng(0).standard_normal(2002)
+    series = noise[2:] + 0.6*noise[1:-1] + 0.3*noise[:-2]
+
+    banded_calls = []
+    eig_banded = toeplitz_decompose.eig_banded
+    monkeypatch.setattr(
+        toeplitz_decompose, "eig_banded", lambda *args, **kwargs: banded_calls.append(1) or eig_banded(*args, **kwargs)
+    )
+
+    # Exact covariance keeps the dense eigensolver
+    exact = Decompose(time_series=series, window_size=200, method="toeplitz")
+    exact.fit()
+    assert not banded_calls
+
+    # Truncated covariance uses the banded eigensolver
+    decomposer = Decompose(time_series=series, window_size=200, method="toeplitz", band_tol=0.1)
+    decomposer.fit()
+    assert banded_calls
+    covs = decomposer._autocovariance()
+    assert np.all(covs[3:] == 0)
+
+    # Banded eigenvectors diagonalize the truncated Toeplitz matrix
+    C_tilde = decomposer._toeplitz_matrix()
+    banded_vals = np.sort(np.diag(decomposer.U.T @ C_tilde @ decomposer.U))
+    np.testing.assert_allclose(banded_vals, np.linalg.eigvalsh(C_tilde), atol=1e-10)
+
+    # Eigenvalues move by at most twice the dropped autocovariances
+    exact_covs = exact._autocovariance()
+    shift = np.abs(np.linalg.eigvalsh(exact._toeplitz_matrix()) - np.linalg.eigvalsh(C_tilde))
+    assert shift.max() <= 2 * np.abs(exact_covs[3:]).sum()
+
+    # band_tol is validated
+    with pytest.raises(ValueError):
+        Decompose(time_series=series, window_size=200, method="toeplitz", band_tol=1.5)
+    with pytest.raises(ValueError):
+        Decompose(time_series=series, window_size=200, band_tol=0.1)
+
+def test_basic_eigh_svd():
+    # Generate synthetic data
+    t = np.linspace(0, 10, 200)
+    series = np.sin(t) + 0.5*np.sin(3*t) + 0.3*t
+
+    full = Decompose(time_series=series, window_size=30)
+    full.fit()
+    decomposer = Decompose(time_series=series, window_size=30, svd_method="eigh")
+    decomposer.fit()
+
+    assert decomposer.d == full.d
+    np.testing.assert_allclose(decomposer.sigma[:full.d], full.sigma[:full.d], rtol=1e-6)
+    np.testing.assert_allclose(
+        reconstruct(decomposer, [[0, 1, 2]]), reconstruct(full, [[0, 1, 2]]), atol=1e-6
+    )
+
+    # Low-rank series keeps the rank of the trajectory matrix
+    low_rank = Decompose(time_series=np.sin(t), window_size=30, svd_method="eigh")
+    low_rank.fit()
+    assert low_rank.d == np.linalg.matrix_rank(low_rank.trajectory_matrix)
+
+    # Non-finite values are rejected like in the other SVD methods
+    for value in [np.nan, np.inf]:
+        corrupted = series.copy()
+        corrupted[50] = value
+        with pytest.raises(ValueError):
+            Decompose(time_series=corrupted, window_size=30, svd_method="eigh").fit()
+
+def test_randomized_svd(monkeypatch):
+    basic_decompose = importlib.import_module("essa.basic_decompose")
+    rng = np.random.default_rng(0)
+    t = np.linspace(0, 10, 300)
+
+    # Full-rank noisy series, low-rank pure sinusoid, and float32 input
+    cases = [
+        (np.sin(t) + 0.3*rng.standard_normal(len(t)), np.float64, 1e-8),
+        (np.sin(t), np.float64, 1e-8),
+        (np.sin(t) + 0.3*rng.standard_normal(len(t)), np.float32, 1e-4),
+    ]
+
+    for series, dtype, tol in cases:
+        matrix = np.lib.stride_tricks.sliding_window_view(series.astype(dtype), 30).T
+        s_full = basic_decompose.full_svd(matrix.astype(np.float64), compute_uv=False)
+
+        # Same settings as BasicDecompose uses for a window size of 30
+        U, s, Vt = basic_decompose._randomized_svd(matrix, n_components=20, n_oversamples=100, n_iter=15)
+
+        assert U.shape == (30, 20) and s.shape == (20,) and Vt.shape == (20, 271)
+        assert U.dtype == dtype
+        np.testing.assert_allclose(s, s_full[:20], atol=tol * s_full[0])
+        # Singular vectors of the numerically zero singular values are arbitrary
+        rank = np.count_nonzero(s_full[:20] > tol * s_full[0])
+        np.testing.assert_allclose(U.T @ U, np.eye(20), atol=tol)
+        np.testing.assert_allclose(Vt[:rank] @ Vt[:rank].T, np.eye(rank), atol=tol)
+
+    qr_calls = []
+    qr = basic_decompose.qr
+    monkeypatch.setattr(basic_decompose, "qr", lambda *args, **kwargs: qr_calls.append(1) or qr(*args, **kwargs))
+
+    # Well-conditioned basis is orthonormalized with Cholesky-QR
+    Y = rng.standard_normal((300, 10))
+    Q = basic_decompose._orthonormalize(Y)
+    assert not qr_calls
+    np.testing.assert_allclose(Q.T @ Q, np.eye(10), atol=1e-12)
+    np.testing.assert_allclose(Q @ (Q.T @ Y), Y, atol=1e-12)
+
+    # Rank-2 sinusoid basis makes Cholesky-QR unusable and falls back to QR
+    Y = np.lib.stride_tricks.sliding_window_view(np.sin(t), 10)
+    Q = basic_decompose._orthonormalize(Y)
+    assert qr_calls
+    np.testing.assert_allclose(Q.T @ Q, np.eye(10), atol=1e-12)
+    np.testing.assert_allclose(Q @ (Q.T @ Y), Y, atol=1e-12)
+
+def test_toeplitz_concurrent_fits():
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Generate synthetic data
+    rng = np.random.default_rng(0)
+    series_list = [rng.standard_normal(300) for _ in range(12)]
+
+    def fit(args):
+        series, window_size = args
+        decomposer = Decompose(time_series=series, window_size=window_size, method="toeplitz")
+        decomposer.fit()
+        return decomposer.sigma
+
+    # More distinct series than cache entries, so threads evict each other's keys
+    jobs = [(series, window_size) for series in series_list for window_size in (10, 20)] * 3
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(fit, jobs))
+
+    for (series, window_size), sigma in zip(jobs, results):
+        np.testing.assert_allclose(sigma, fit((series, window_size)))